@@ -3,7 +3,18 @@ from dotenv import load_dotenv
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
-load_dotenv(override=True)
+__all__ = [
+    "VectorDBConfig", "MilvusConfig", "MySQLConfig",
+    "VECTOR_DB_CONFIG", "MILVUS_CONFIG", "MYSQL_CONFIG",
+    "EMB_URL", "EMBEDDING_DIM", "DEFAULT_COLLECTION",
+    "MILVUS_URL", "MILVUS_DB_NAME", "MILVUS_PW",
+    "MYSQL_USER", "MYSQL_PASSWORD", "MYSQL_PORT", "MYSQL_HOST", "MYSQL_DATABASE",
+]
+
+# Parse the .env file exactly once per process
+if not os.environ.get("_MCP_ENV_LOADED"):
+    load_dotenv(override=True)
+    os.environ["_MCP_ENV_LOADED"] = "1"
 
 @dataclass
 class VectorDBConfig:
@@ -28,41 +39,40 @@ class MySQLConfig:
     port: int = 3306
     database: Optional[str] = None
 
-# Vector Database Config
-EMB_URL = os.getenv("EMBEDDING_END_POINT", None)
-EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "4096"))
-DEFAULT_COLLECTION = os.getenv("DEFAULT_COLLECTION", "annual_report_0821")
-
-# Milvus Config
-MILVUS_URL = os.getenv("MILVUS_URL", None)
-MILVUS_DB_NAME = os.getenv("MILVUS_DB_NAME", "default")
-MILVUS_PW = os.getenv("MILVUS_PW", None)
-
-# MySQL Config
-MYSQL_USER = os.getenv("MYSQL_USER")
-MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
-MYSQL_PORT = int(os.getenv("MYSQL_PORT", 3306))
-MYSQL_HOST = os.getenv("MYSQL_HOST")
-MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
-
-# Configuration instances
+# Configuration instances - env values are read and cast exactly once here
 VECTOR_DB_CONFIG = VectorDBConfig(
-    embedding_url=EMB_URL,
-    embedding_dim=EMBEDDING_DIM,
-    default_collection=DEFAULT_COLLECTION
+    embedding_url=os.getenv("EMBEDDING_END_POINT", None),
+    embedding_dim=int(os.getenv("EMBEDDING_DIM", "4096")),
+    default_collection=os.getenv("DEFAULT_COLLECTION", "annual_report_0821")
 )
 
 MILVUS_CONFIG = MilvusConfig(
-    url=MILVUS_URL,
-    db_name=MILVUS_DB_NAME,
-    password=MILVUS_PW
+    url=os.getenv("MILVUS_URL", None),
+    db_name=os.getenv("MILVUS_DB_NAME", "default"),
+    password=os.getenv("MILVUS_PW", None)
 )
 
 MYSQL_CONFIG = MySQLConfig(
-    user=MYSQL_USER,
-    password=MYSQL_PASSWORD,
-    host=MYSQL_HOST,
-    port=MYSQL_PORT,
-    database=MYSQL_DATABASE
+    user=os.getenv("MYSQL_USER"),
+    password=os.getenv("MYSQL_PASSWORD"),
+    host=os.getenv("MYSQL_HOST"),
+    port=int(os.getenv("MYSQL_PORT", 3306)),
+    database=os.getenv("MYSQL_DATABASE")
 )
 
+# Backwards-compatible scalar aliases, derived from the instances above so
+# downstream `from src.config import ...` imports pay no repeated parsing
+EMB_URL = VECTOR_DB_CONFIG.embedding_url
+EMBEDDING_DIM = VECTOR_DB_CONFIG.embedding_dim
+DEFAULT_COLLECTION = VECTOR_DB_CONFIG.default_collection
+
+MILVUS_URL = MILVUS_CONFIG.url
+MILVUS_DB_NAME = MILVUS_CONFIG.db_name
+MILVUS_PW = MILVUS_CONFIG.password
+
+MYSQL_USER = MYSQL_CONFIG.user
+MYSQL_PASSWORD = MYSQL_CONFIG.password
+MYSQL_PORT = MYSQL_CONFIG.port
+MYSQL_HOST = MYSQL_CONFIG.host
+MYSQL_DATABASE = MYSQL_CONFIG.database
+
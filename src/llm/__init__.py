@@ -1 +1 @@
-from .llm import llm
\ No newline at end of file
+from .llm import llm, router_llm
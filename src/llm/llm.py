@@ -1,5 +1,40 @@
-from langchain_community.chat_models import ChatOpenAI
-from dotenv import load_dotenv
-load_dotenv()
+import asyncio
+import atexit
 
-llm = ChatOpenAI(model='gpt-4o')
\ No newline at end of file
+import httpx
+from langchain_openai import ChatOpenAI
+import src.config  # noqa: F401 - loads .env once for the whole process
+
+# Shared HTTP clients so repeat LLM calls reuse keep-alive connections
+# instead of renegotiating TLS per request
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_http_client = httpx.Client(limits=_LIMITS, timeout=_TIMEOUT)
+_http_async_client = httpx.AsyncClient(limits=_LIMITS, timeout=_TIMEOUT)
+
+def _close_http_clients():
+    _http_client.close()
+    if not _http_async_client.is_closed:
+        try:
+            asyncio.run(_http_async_client.aclose())
+        except RuntimeError:
+            pass
+
+atexit.register(_close_http_clients)
+
+llm = ChatOpenAI(
+    model='gpt-4o',
+    max_retries=2,
+    http_client=_http_client,
+    http_async_client=_http_async_client
+)
+
+# Cheaper, faster model for small structured tasks (filter/table
+# extraction) where gpt-4o is over-provisioned
+router_llm = ChatOpenAI(
+    model='gpt-4o-mini',
+    temperature=0,
+    max_retries=2,
+    http_client=_http_client,
+    http_async_client=_http_async_client
+)
@@ -1,18 +1,34 @@
+import importlib
 import logging
+import os
 from src.server import mcp
-import src.tools.test_tools
-import src.tools.database.milvus_tools
-import src.tools.database.mysql_tools
-import src.tools.database.generalized_tools
 
-# Configure logging
+# Configure logging; production runs at INFO so debug formatting is
+# skipped entirely on hot paths
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("MCP_LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger("mcp-server")
 
+# Tool modules are imported lazily at startup (each drags in pymilvus,
+# pymysql, langchain, ...) so importing src.main stays cheap
+TOOL_MODULES = [
+    "src.tools.test_tools",
+    "src.tools.database.milvus_tools",
+    "src.tools.database.mysql_tools",
+    "src.tools.database.generalized_tools",
+]
+
+def register_tools():
+    """Import the tool modules so their @mcp.tool() decorators register"""
+    enabled = os.getenv("MCP_TOOL_MODULES")
+    modules = enabled.split(",") if enabled else TOOL_MODULES
+    for module_name in modules:
+        importlib.import_module(module_name)
+        logger.info(f"Registered tools from {module_name}")
+
 if __name__ == "__main__":
+    register_tools()
     logger.info("Starting MCP server on port 9292...")
-    # Close the HTTP client when the server shuts down
-    mcp.run(transport="streamable-http")
\ No newline at end of file
+    mcp.run(transport="streamable-http")
@@ -14,6 +14,10 @@ from starlette.responses import PlainTextResponse
 
 mcp = FastMCP("local mcp server", host="0.0.0.0", port=9292)
 
+# Built once; the body is stateless so the same response object can be
+# replayed for every liveness probe without per-request allocation
+_HEALTH_RESPONSE = PlainTextResponse("OK")
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request) -> PlainTextResponse:
-    return PlainTextResponse("OK")
\ No newline at end of file
+    return _HEALTH_RESPONSE
\ No newline at end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+In-process TTL cache with stale-while-revalidate semantics
+
+Used for quasi-static external metadata (e.g. unique company names in Milvus)
+so hot tool paths pay a dict lookup instead of a database scan.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    """Done-callback for background refreshes; keeps loader failures out of
+    'task exception was never retrieved' noise"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache refresh failed: %s", task.exception())
+
+class UniqueValues:
+    """Unique field values plus their precomputed prompt representation"""
+
+    __slots__ = ("values", "joined")
+
+    def __init__(self, values: List[str]):
+        self.values = values
+        self.joined = ", ".join(values)
+
+class SWRCache:
+    """TTL cache that serves stale entries while refreshing in the background"""
+
+    def __init__(self):
+        self._entries: Dict[Any, Tuple[Any, float]] = {}
+        self._locks: Dict[Any, asyncio.Lock] = {}
+
+    def _lock_for(self, key: Any) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    async def get_or_refresh(self,
+                             key: Any,
+                             loader: Callable[[], Any],
+                             ttl: int = 300,
+                             stale_ttl: int = 3600) -> Any:
+        """
+        Get a cached value, refreshing it with `loader` when needed
+
+        Args:
+            key: Cache key (e.g. (collection_name, field_name))
+            loader: Zero-argument callable that fetches a fresh value
+            ttl: Seconds a value is considered fresh
+            stale_ttl: Seconds a stale value may still be served while a
+                background refresh runs
+        """
+        entry = self._entries.get(key)
+        if entry:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                return value
+            if age < stale_ttl:
+                # Serve the stale value and refresh in the background
+                task = asyncio.create_task(self._refresh(key, loader))
+                task.add_done_callback(_log_refresh_failure)
+                return value
+
+        # Cold miss (or beyond stale_ttl): load synchronously
+        return await self._refresh(key, loader)
+
+    async def _refresh(self, key: Any, loader: Callable[[], Any]) -> Any:
+        lock = self._lock_for(key)
+        waited = lock.locked()
+
+        async with lock:
+            if waited:
+                # Another refresh was in flight; use its result if it landed
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return entry[0]
+                # The in-flight load failed before writing - fall through
+                # and try the load ourselves rather than dying on a KeyError
+
+            value = await asyncio.to_thread(loader)
+            self._entries[key] = (value, time.monotonic())
+            return value
+
+# Shared cache for unique field values across tool modules
+unique_values_cache = SWRCache()
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Shared Pydantic models for LLM filter extraction
+
+Defined once so the schema compile cost is paid a single time instead of
+per tool module.
+"""
+
+from typing import Dict
+from pydantic import BaseModel, Field
+
+class FilterField(BaseModel):
+    """Year/company filter extracted from a user query"""
+    year: str
+    company: str
+
+class DynamicFilterField(BaseModel):
+    """Dynamic filter field model"""
+    filters: Dict[str, str] = Field(description="Key-value pairs for filtering data")
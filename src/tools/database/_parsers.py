@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+orjson-backed output parsing for LLM chains
+
+orjson decodes the common case (clean JSON object from the model) several
+times faster than the stdlib parser; anything it rejects (markdown fences,
+partial output) falls back to JsonOutputParser's tolerant path.
+"""
+
+from typing import Any, List
+
+import orjson
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.outputs import Generation
+
+class ORJSONOutputParser(JsonOutputParser):
+    """JsonOutputParser that fast-paths clean JSON through orjson
+
+    parse_result is the entry point chains actually invoke (parse()
+    delegates to it), so the fast path is hooked there.
+    """
+
+    def parse_result(self, result: List[Generation], *, partial: bool = False) -> Any:
+        if not partial:
+            try:
+                return orjson.loads(result[0].text.strip())
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse_result(result, partial=partial)
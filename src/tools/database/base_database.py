@@ -59,6 +59,12 @@ class TabularDatabase(ABC):
         """Execute a SQL query"""
         pass
 
+    @abstractmethod
+    def execute_query_iter(self, query: str, params: Optional[List[Any]] = None,
+                           batch_size: int = 1000):
+        """Execute a SQL query and yield rows without materializing the result set"""
+        pass
+
     @abstractmethod
     def insert_data(self, table_name: str, data: List[Dict[str, Any]]) -> int:
         """Insert data into a table"""
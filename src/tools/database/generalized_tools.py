@@ -1,20 +1,79 @@
+import asyncio
+import os
+
 from src.server import mcp
 from src.tools.database.vectorDB import a_embed_query
-from src.config import VECTOR_DB_CONFIG, MILVUS_CONFIG, MYSQL_CONFIG
-from src.llm import llm
+from src.config import VECTOR_DB_CONFIG, MILVUS_CONFIG
+from src.llm import router_llm
 from src.tools.database.base_database import DatabaseFactory
+from src.tools.database.tabularDB import pool
+from src.tools.database._cache import UniqueValues, unique_values_cache
 
-from langchain_core.output_parsers import JsonOutputParser
 from langchain.prompts import PromptTemplate
-from pydantic import BaseModel, Field
 from typing import Dict, List, Any, Optional
 
-from dotenv import load_dotenv
-load_dotenv()
+from src.tools.database._models import DynamicFilterField
+from src.tools.database._parsers import ORJSONOutputParser
+
+# Parser, prompts and chains are compiled once at import so each call only
+# pays for the LLM round-trip itself
+_FILTER_PARSER = ORJSONOutputParser(pydantic_object=DynamicFilterField)
+_FORMAT_INSTRUCTIONS = _FILTER_PARSER.get_format_instructions()
+
+_ANNUAL_PROMPT = PromptTemplate(template="""
+        Extract filtering criteria from the user's query. Available companies: {companies}
+        Look for company names and years in the query.
+
+        <USER_QUERY>
+        {query}
+        </USER_QUERY>
+
+        Format the output according to these instructions:
+        {format_instructions}
+        """,
+        input_variables=['query', 'companies'],
+        partial_variables={'format_instructions': _FORMAT_INSTRUCTIONS}
+)
 
-class FilterField(BaseModel):
-    """Dynamic filter field model"""
-    filters: Dict[str, str] = Field(description="Key-value pairs for filtering data")
+_GENERIC_PROMPT = PromptTemplate(template="""
+        Extract any filtering criteria from the user's query such as source, date, category, etc.
+
+        <USER_QUERY>
+        {query}
+        </USER_QUERY>
+
+        Format the output according to these instructions:
+        {format_instructions}
+        """,
+        input_variables=['query'],
+        partial_variables={'format_instructions': _FORMAT_INSTRUCTIONS}
+)
+
+# Filter extraction is a tiny structured task - route it to the cheap model
+_ANNUAL_FILTER_CHAIN = _ANNUAL_PROMPT | router_llm | _FILTER_PARSER
+_GENERIC_FILTER_CHAIN = _GENERIC_PROMPT | router_llm | _FILTER_PARSER
+
+# Handlers cached per (collection, schema_type) so repeat calls skip
+# gRPC channel setup and collection initialization
+_VDB_HANDLERS: Dict[tuple, Any] = {}
+
+def _get_vdb(collection_name: str, schema_type: str):
+    """Get (or lazily create) a cached vector database handler"""
+    key = (collection_name, schema_type)
+    if key not in _VDB_HANDLERS:
+        vector_db = DatabaseFactory.create_vector_db(
+            "milvus",
+            host=MILVUS_CONFIG.url,
+            db_name=MILVUS_CONFIG.db_name,
+            password=MILVUS_CONFIG.password,
+            collection_name=collection_name,
+            embedding_dim=VECTOR_DB_CONFIG.embedding_dim,
+            schema_type=schema_type
+        )
+        vector_db.initialize_collection()
+        _VDB_HANDLERS[key] = vector_db
+
+    return _VDB_HANDLERS[key]
 
 @mcp.tool()
 async def search_vector_database(query: str,
@@ -37,19 +96,8 @@ async def search_vector_database(query: str,
         if not collection_name:
             collection_name = VECTOR_DB_CONFIG.default_collection
 
-        # Create vector database instance
-        vector_db = DatabaseFactory.create_vector_db(
-            "milvus",
-            host=MILVUS_CONFIG.url,
-            db_name=MILVUS_CONFIG.db_name,
-            password=MILVUS_CONFIG.password,
-            collection_name=collection_name,
-            embedding_dim=VECTOR_DB_CONFIG.embedding_dim,
-            schema_type=schema_type
-        )
-
-        # Initialize collection
-        vector_db.initialize_collection()
+        # Get cached vector database instance
+        vector_db = _get_vdb(collection_name, schema_type)
 
         # Get embedding for the query
         embed_result = await a_embed_query(query)
@@ -96,57 +144,30 @@ async def smart_search_with_filter_extraction(query: str,
         if not collection_name:
             collection_name = VECTOR_DB_CONFIG.default_collection
 
-        # Create vector database instance
-        vector_db = DatabaseFactory.create_vector_db(
-            "milvus",
-            host=MILVUS_CONFIG.url,
-            db_name=MILVUS_CONFIG.db_name,
-            password=MILVUS_CONFIG.password,
-            collection_name=collection_name,
-            embedding_dim=VECTOR_DB_CONFIG.embedding_dim,
-            schema_type=schema_type
-        )
+        # Get cached vector database instance
+        vector_db = _get_vdb(collection_name, schema_type)
 
-        # Initialize collection
-        vector_db.initialize_collection()
+        # Kick off the embedding request so it overlaps the LLM call below
+        embed_task = asyncio.create_task(a_embed_query(query))
 
-        # Get available filter fields based on schema type
+        # Pick the precompiled extraction chain based on schema type
         if schema_type == "annual_report":
-            available_fields = vector_db.get_unique_values("company")
-            filter_prompt = f"""
-            Extract filtering criteria from the user's query. Available companies: {', '.join(available_fields)}
-            Look for company names and years in the query.
-            """
+            available_fields = await unique_values_cache.get_or_refresh(
+                (collection_name, "company"),
+                lambda: UniqueValues(vector_db.get_unique_values("company"))
+            )
+            chain = _ANNUAL_FILTER_CHAIN
+            chain_input = {'query': query, 'companies': available_fields.joined}
         else:
-            filter_prompt = """
-            Extract any filtering criteria from the user's query such as source, date, category, etc.
-            """
-
-        # Use LLM to extract filters
-        output_parser = JsonOutputParser(pydantic_object=FilterField)
+            chain = _GENERIC_FILTER_CHAIN
+            chain_input = {'query': query}
 
-        PROMPT = PromptTemplate(template=f"""
-        {filter_prompt}
-
-        <USER_QUERY>
-        {{query}}
-        </USER_QUERY>
-
-        Format the output according to these instructions:
-        {{format_instructions}}
-        """,
-        input_variables=['query', 'format_instructions']
+        # Run filter extraction and embedding concurrently
+        extracted_filters, embed_result = await asyncio.gather(
+            chain.ainvoke(chain_input),
+            embed_task
         )
 
-        chain = PROMPT | llm | output_parser
-        extracted_filters = chain.invoke({
-            'query': query,
-            'format_instructions': output_parser.get_format_instructions()
-        })
-
-        # Get embedding for the query
-        embed_result = await a_embed_query(query)
-
         # Perform search with extracted filters
         results = vector_db.search(
             query_embedding=embed_result['vector'],
@@ -172,33 +193,33 @@ async def smart_search_with_filter_extraction(query: str,
         }
 
 @mcp.tool()
-async def query_tabular_database(sql_query: str, table_name: str = None):
+async def query_tabular_database(sql_query: str, table_name: str = None,
+                                 limit: int = 1000, offset: int = 0):
     """
     Execute SQL queries on the configured tabular database
 
     Args:
         sql_query: SQL query to execute
         table_name: Optional table name for validation
+        limit: Maximum number of rows to return (0 for no limit)
+        offset: Number of rows to skip before collecting results
     """
     try:
-        # Create tabular database instance
-        tabular_db = DatabaseFactory.create_tabular_db(
-            "mysql",
-            host=MYSQL_CONFIG.host,
-            user=MYSQL_CONFIG.user,
-            password=MYSQL_CONFIG.password,
-            database=MYSQL_CONFIG.database,
-            port=MYSQL_CONFIG.port
-        )
-
-        # Execute query
-        results = tabular_db.execute_query(sql_query)
-
-        # Close connection
-        tabular_db.close()
+        # Stream rows from a pooled connection so memory stays bounded
+        # regardless of result-set size
+        with pool.acquire() as tabular_db:
+            results = []
+            for i, row in enumerate(tabular_db.execute_query_iter(sql_query)):
+                if i < offset:
+                    continue
+                results.append(row)
+                if limit and len(results) >= limit:
+                    break
 
         return {
             "query": sql_query,
+            "limit": limit,
+            "offset": offset,
             "total_results": len(results),
             "results": results
         }
@@ -223,15 +244,7 @@ async def get_database_info(database_type: str = "vector", collection_name: str
             if not collection_name:
                 collection_name = VECTOR_DB_CONFIG.default_collection
 
-            vector_db = DatabaseFactory.create_vector_db(
-                "milvus",
-                host=MILVUS_CONFIG.url,
-                db_name=MILVUS_CONFIG.db_name,
-                password=MILVUS_CONFIG.password,
-                collection_name=collection_name,
-                embedding_dim=VECTOR_DB_CONFIG.embedding_dim,
-                schema_type="document"
-            )
+            vector_db = _get_vdb(collection_name, "document")
 
             stats = vector_db.get_collection_stats()
             return {
@@ -244,17 +257,11 @@ async def get_database_info(database_type: str = "vector", collection_name: str
             }
 
         elif database_type == "tabular":
-            tabular_db = DatabaseFactory.create_tabular_db(
-                "mysql",
-                host=MYSQL_CONFIG.host,
-                user=MYSQL_CONFIG.user,
-                password=MYSQL_CONFIG.password,
-                database=MYSQL_CONFIG.database,
-                port=MYSQL_CONFIG.port
-            )
-
-            stats = tabular_db.get_database_stats()
-            tabular_db.close()
+            # Admin path: bypass the pool by default so stats calls don't
+            # trigger a pool warmup on otherwise idle servers
+            use_pool = os.getenv("MCP_USE_POOL_FOR_ADMIN", "0") == "1"
+            with pool.acquire(use_pool=use_pool) as tabular_db:
+                stats = tabular_db.get_database_stats()
 
             return {
                 "database_type": "tabular",
@@ -1,21 +1,18 @@
+import logging
+
 from src.server import mcp
 from src.tools.database.vectorDB import MilvusHandler
 from src.tools.database.vectorDB import a_embed_query
 from src.config import MILVUS_CONFIG, VECTOR_DB_CONFIG
-from src.llm import llm
+from src.llm import router_llm
+from src.tools.database._cache import UniqueValues, unique_values_cache
 
-from langchain_core.output_parsers import JsonOutputParser
 from langchain.prompts import PromptTemplate
 
-from langchain_community.chat_models import ChatOpenAI
-from pydantic import BaseModel, Field
-
-from dotenv import load_dotenv
-load_dotenv()
+from src.tools.database._models import FilterField
+from src.tools.database._parsers import ORJSONOutputParser
 
-class FilterField(BaseModel):
-    year: str
-    company: str
+logger = logging.getLogger(__name__)
 
 @mcp.tool()
 async def extract_from_milvus(query: str):
@@ -26,8 +23,11 @@ async def extract_from_milvus(query: str):
     ## Initialized class
     milvus_handler = MilvusHandler(host=MILVUS_CONFIG.url, db_name=MILVUS_CONFIG.db_name, password=MILVUS_CONFIG.password)
     embed_query = await a_embed_query(query)
-    unique_company_name = milvus_handler.extract_unique_company_name()
-    output_parser = JsonOutputParser(pydantic_object=FilterField)
+    unique_company_name = await unique_values_cache.get_or_refresh(
+        (milvus_handler.collection_name, "company"),
+        lambda: UniqueValues(milvus_handler.extract_unique_company_name())
+    )
+    output_parser = ORJSONOutputParser(pydantic_object=FilterField)
 
     PROMPT = PromptTemplate(template="""
     Please extract from the user's query if the query explicit the company and year
@@ -48,15 +48,15 @@ async def extract_from_milvus(query: str):
     input_variables=['query', 'company_name','format_instructions']
     )
 
-    chain = PROMPT | llm | output_parser
-    results = chain.invoke({
+    chain = PROMPT | router_llm | output_parser
+    results = await chain.ainvoke({
         'query': query,
-        'company_name': ', '.join(unique_company_name),
+        'company_name': unique_company_name.joined,
         'format_instructions': output_parser.get_format_instructions()
     })
 
     year, company = results['year'], results['company']
-    print(year, company)
+    logger.debug("Extracted filters: year=%s company=%s", year, company)
     vdb_results = milvus_handler.hybrid_search_similar_chunks(
         query_embedding=embed_query['vector'],
         query_text=embed_query['text'],
@@ -1,5 +1,8 @@
+import logging
+
 from src.server import mcp
 from src.tools.database.tabularDB import MySQLHandler
+from src.tools.database._cache import SWRCache
 from src.config import (
     MYSQL_HOST,
     MYSQL_USER,
@@ -7,87 +10,40 @@ from src.config import (
     MYSQL_DATABASE,
     MYSQL_PORT,
 )
-from langchain_core.output_parsers import JsonOutputParser
 from langchain.prompts import PromptTemplate
 
-from langchain_community.chat_models import ChatOpenAI
+from src.tools.database._parsers import ORJSONOutputParser
+
 from pydantic import BaseModel, Field
 from typing import List
 from src.llm import llm
-from dotenv import load_dotenv
-load_dotenv()
 
-@mcp.tool()
-async def extract_from_mysql(query: str):
-    """
-    Extract tabular data from mysql database, the user should provide a query
-    """
+logger = logging.getLogger(__name__)
 
-    ## Initialized class
-    mysql_handler = MySQLHandler(
-        host=MYSQL_HOST,
-        user=MYSQL_USER,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
-        port=MYSQL_PORT
-    )
-
-    class Fields(BaseModel):
+class FilterField(BaseModel):
+    conditions: str = Field(description="The conditions for the WHERE clause")
 
-        query_to_get_fields_name: str = Field(description="The SQL query to get fields name of the table")
-        table_name: str = Field(description="The name of the table")
+# Parsers, prompts and chains are built once at import; per-call work is
+# just the LLM round-trip
+_CONDITIONS_PARSER = ORJSONOutputParser(pydantic_object=FilterField)
 
-    class FilterField(BaseModel):
-        conditions: str = Field(description="The conditions for the WHERE clause")
+# Key is the table name, value is the description. With a single known
+# table the routing step needs no LLM call; extend this dict (and bring
+# back a routing prompt) when more tables are added.
+_TABLE_DESCRIPTION = {
+    'cri_cri_prod_marcus_daily_complete_latest': "CRI Probability Default Data"
+}
+_DEFAULT_TABLE = 'cri_cri_prod_marcus_daily_complete_latest'
 
-    output_parser_agent1 = JsonOutputParser(pydantic_object=Fields)
-    output_parser = JsonOutputParser(pydantic_object=FilterField)
+# Column lists are quasi-static; cache them so the INFORMATION_SCHEMA
+# round-trip is paid once per TTL instead of once per call
+_columns_cache = SWRCache()
 
-    table_description = str({
-        'cri_cri_prod_marcus_daily_complete_latest': "CRI Probability Default Data"
-    })
-    ## First step to get the table name and column names
-    Agent1_PROMPT = PromptTemplate(template="""
-    You are an expert in SQL. 
-    
-    Given a user's request:
-    1. Identify the relevant table in the database.
-    2. Generate a SQL query to List all columns name in the table.
-
-    Ensure the query is syntactically correct and only includes SELECT statements.
-    
-    <USER_QUERY>
-    User's request:
-    {query}
-    </USER_QUERY>
-    
-    <TABLE_INFO>
-    Your are provided with the following table descriptions, key is the table name and value is the description:
-    {table_description}
-    Please note that the provided table name is the actual table name, you should not make any changes.
-    </TABLE_INFO>
-    
-    <FORMAT>
-    Format the output according to these instructions:
-    {format_instructions}
-    </FORMAT>
-    """,
-    input_variables=['query', 'table_description','format_instructions']
-    )
+def _load_columns(mysql_handler: MySQLHandler, table_name: str) -> List[str]:
+    """Fetch the column names of a table"""
+    return list(mysql_handler.fetch_df(f"SHOW COLUMNS FROM {table_name}")['Field'])
 
-    chain = Agent1_PROMPT | llm | output_parser_agent1
-    results = chain.invoke({
-        'query': query,
-        'table_description': table_description,
-        'format_instructions': output_parser_agent1.get_format_instructions()
-    })
-    table_name, query_to_get_fields_name = results['table_name'], results['query_to_get_fields_name']
-    print(f"Identified Table: {table_name}, Columns: {query_to_get_fields_name}")
-
-    column_names = list(mysql_handler.fetch_df(query=query_to_get_fields_name)['COLUMN_NAME'])
-
-    ## Second step to get the conditions
-    PROMPT = PromptTemplate(template="""
+_CONDITIONS_PROMPT = PromptTemplate(template="""
     You are an expert in SQL. Given a user's request, generate a SQL query to extract the required data from a MySQL database.
     Ensure the query is syntactically correct and only includes SELECT statements.
 
@@ -101,21 +57,43 @@ async def extract_from_mysql(query: str):
     Format the output according to these instructions:
     {format_instructions}
     """,
-    input_variables=['query', 'table_name', 'column_names', 'format_instructions']
+    input_variables=['query', 'table_name', 'column_names'],
+    partial_variables={'format_instructions': _CONDITIONS_PARSER.get_format_instructions()}
+)
+
+_CONDITIONS_CHAIN = _CONDITIONS_PROMPT | llm | _CONDITIONS_PARSER
+
+@mcp.tool()
+async def extract_from_mysql(query: str):
+    """
+    Extract tabular data from mysql database, the user should provide a query
+    """
+
+    ## Initialized class
+    mysql_handler = MySQLHandler(
+        host=MYSQL_HOST,
+        user=MYSQL_USER,
+        password=MYSQL_PASSWORD,
+        database=MYSQL_DATABASE,
+        port=MYSQL_PORT
+    )
+
+    table_name = _DEFAULT_TABLE
+    column_names = await _columns_cache.get_or_refresh(
+        (MYSQL_DATABASE, table_name),
+        lambda: _load_columns(mysql_handler, table_name),
+        ttl=3600
     )
 
-    chain = PROMPT | llm | output_parser
-    results = chain.invoke({
+    results = await _CONDITIONS_CHAIN.ainvoke({
         'query': query,
-        'format_instructions': output_parser.get_format_instructions(),
         'table_name': table_name,
         'column_names': ', '.join(column_names)
     })
 
     conditions = results['conditions']
-    
+
     sql_query = f"SELECT {', '.join(column_names)} FROM {table_name} WHERE {conditions};"
-    print(f"Generated SQL Query: {sql_query}")
+    logger.debug("Generated SQL query: %s", sql_query)
     db_results = mysql_handler.fetch_df(sql_query)
     return db_results
-
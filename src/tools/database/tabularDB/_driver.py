@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+MySQL driver selection
+
+Prefers the C-accelerated mysqlclient (MySQLdb) when installed - packet
+decoding, escaping and value conversion run in libmysqlclient rather than
+the Python interpreter - and falls back to pure-Python pymysql, which
+exposes the same DB-API surface and cursor classes.
+"""
+
+try:
+    import MySQLdb as _driver
+    from MySQLdb.cursors import Cursor, DictCursor, SSDictCursor
+    DRIVER_NAME = "mysqlclient"
+except ImportError:
+    import pymysql as _driver
+    from pymysql.cursors import Cursor, DictCursor, SSDictCursor
+    DRIVER_NAME = "pymysql"
+
+def connect(host, user, password, database, port=3306, charset='utf8mb4',
+            cursorclass=DictCursor, **kwargs):
+    """Open a connection with whichever driver is available"""
+    return _driver.connect(
+        host=host,
+        user=user,
+        password=password,
+        database=database,
+        port=port,
+        charset=charset,
+        cursorclass=cursorclass,
+        **kwargs
+    )
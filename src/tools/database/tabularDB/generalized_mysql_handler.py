@@ -5,12 +5,35 @@ Generalized MySQL Database Client
 Handles CRUD operations for tabular data with configurable connections and schemas.
 """
 
-import pymysql
+import asyncio
 import logging
+import operator
 from typing import List, Dict, Any, Optional
 from contextlib import contextmanager
+from cachetools import TTLCache
+from . import _driver
 from ..base_database import TabularDatabase
 
+logger = logging.getLogger(__name__)
+
+# Rows per multi-VALUES INSERT statement; large enough to amortize the
+# round-trip, small enough to stay under max_allowed_packet
+INSERT_BATCH_SIZE = 1000
+
+# Above this row count, LOAD DATA LOCAL INFILE streams a TSV past the SQL
+# parser straight into the storage engine
+LOAD_DATA_MIN_ROWS = 50_000
+
+def _infile_value(value: Any) -> str:
+    """Escape a value for a tab-separated LOAD DATA stream"""
+    if value is None:
+        return "\\N"
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
 class GeneralizedMySQLHandler(TabularDatabase):
     """Generalized MySQL database client for various table operations"""
 
@@ -20,7 +43,8 @@ class GeneralizedMySQLHandler(TabularDatabase):
                  password: str,
                  database: str,
                  port: int = 3306,
-                 charset: str = 'utf8mb4'):
+                 charset: str = 'utf8mb4',
+                 use_pool: bool = True):
         """
         Initialize MySQL handler
 
@@ -31,6 +55,8 @@ class GeneralizedMySQLHandler(TabularDatabase):
             database: Database name
             port: MySQL port
             charset: Character set
+            use_pool: Check connections out of the shared pool; disable for
+                one-shot admin paths that should not warm the pool
         """
         self.host = host
         self.user = user
@@ -38,37 +64,75 @@ class GeneralizedMySQLHandler(TabularDatabase):
         self.database = database
         self.port = port
         self.charset = charset
+        self.use_pool = use_pool
         self.connection = None
 
-        # Configure logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        # Read-mostly metadata (table list, schemas) cached per handler so
+        # repeated lookups skip the network round-trip
+        self._metadata_cache = TTLCache(maxsize=64, ttl=300)
+
+        # INSERT statement templates keyed by (table, columns, batch size);
+        # hot ingest paths hit the same few shapes repeatedly
+        self._insert_stmt_cache: Dict[tuple, str] = {}
+
+        # UPDATE/DELETE templates keyed by statement shape; applications
+        # that hammer the same shape (status flips) skip the SQL rebuild
+        self._stmt_cache: Dict[tuple, str] = {}
+
+        # Logging configuration belongs to the application entrypoint;
+        # instances just share the module logger
+        self.logger = logger
 
     def connect(self) -> None:
-        """Establish database connection"""
+        """Check out a pooled database connection (or dial directly)"""
+        from .pool import get_engine
+
         try:
-            self.connection = pymysql.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                charset=self.charset,
-                cursorclass=pymysql.cursors.DictCursor
-            )
+            if self.use_pool:
+                self.connection = get_engine(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database,
+                    port=self.port,
+                    charset=self.charset
+                ).raw_connection()
+            else:
+                # Short-lived direct connection; leaves the pool cold
+                self.connection = _driver.connect(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    database=self.database,
+                    port=self.port,
+                    charset=self.charset,
+                    local_infile=True
+                )
             self.logger.info(f"✅ Connected to MySQL database: {self.database}")
         except Exception as e:
             self.logger.error(f"❌ Failed to connect to MySQL: {e}")
             raise
 
     @contextmanager
-    def get_cursor(self):
-        """Context manager for database cursor"""
+    def get_cursor(self, streaming: bool = False, cursor_cls: Optional[type] = None):
+        """Context manager for database cursor
+
+        Args:
+            streaming: Use an unbuffered server-side cursor so rows stream
+                from the server instead of being materialized client-side
+            cursor_cls: Explicit cursor class (e.g. the plain tuple cursor);
+                overrides the connection default
+        """
         if not self.connection:
             self.connect()
 
+        if cursor_cls is None and streaming:
+            cursor_cls = _driver.SSDictCursor
+
         try:
-            with self.connection.cursor() as cursor:
+            cursor = (self.connection.cursor(cursor_cls)
+                      if cursor_cls else self.connection.cursor())
+            with cursor:
                 yield cursor
                 self.connection.commit()
         except Exception as e:
@@ -76,64 +140,179 @@ class GeneralizedMySQLHandler(TabularDatabase):
             self.logger.error(f"❌ Database operation failed: {e}")
             raise
 
-    def execute_query(self, query: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
-        """Execute a SQL query and return results"""
+    def execute_query(self, query: str, params: Optional[List[Any]] = None,
+                      stream: bool = False) -> List[Dict[str, Any]]:
+        """Execute a SQL query and return results
+
+        Args:
+            query: SQL statement to execute
+            params: Optional query parameters
+            stream: Return a row generator backed by a server-side cursor
+                instead of a materialized list
+        """
+        if stream:
+            return self.iter_query(query, params)
+
         try:
-            with self.get_cursor() as cursor:
+            # Fetch tuples and zip against one shared column-name list:
+            # DictCursor would allocate N fresh key strings per row, while
+            # zip reuses the same interned keys across all rows
+            with self.get_cursor(cursor_cls=_driver.Cursor) as cursor:
                 cursor.execute(query, params or [])
-                results = cursor.fetchall()
+                rows = cursor.fetchall()
+                cols = [d[0] for d in cursor.description] if cursor.description else []
+                results = [dict(zip(cols, row)) for row in rows]
                 self.logger.info(f"📊 Query executed successfully, {len(results)} rows returned")
                 return results
         except Exception as e:
             self.logger.error(f"❌ Query execution failed: {e}")
             raise
 
+    def iter_query(self, query: str, params: Optional[List[Any]] = None):
+        """Execute a SQL query and yield rows from an unbuffered cursor
+
+        Thin wrapper over execute_query_iter for callers that don't care
+        about the fetch batch size.
+        """
+        return self.execute_query_iter(query, params)
+
+    async def a_execute_query(self, query: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """Async wrapper for execute_query
+
+        Runs the blocking driver call in a worker thread so async callers
+        can fan out MySQL and Milvus lookups with asyncio.gather.
+        """
+        return await asyncio.to_thread(self.execute_query, query, params)
+
+    def execute_query_iter(self, query: str, params: Optional[List[Any]] = None,
+                           batch_size: int = 1000):
+        """Execute a SQL query and yield rows batch by batch
+
+        Runs on an unbuffered server-side cursor, so peak memory is bounded
+        by batch_size regardless of result size. On early exit the cursor's
+        close (via the context manager) drains the remaining rows, so the
+        pooled connection is never returned with a half-read result set.
+        """
+        try:
+            with self.get_cursor(streaming=True) as cursor:
+                cursor.execute(query, params or [])
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+        except Exception as e:
+            self.logger.error(f"❌ Query execution failed: {e}")
+            raise
+
     def insert_data(self, table_name: str, data: List[Dict[str, Any]]) -> int:
         """Insert data into a table"""
         if not data:
             self.logger.warning("No data to insert")
             return 0
 
+        # Get column names from the first record
+        columns = list(data[0].keys())
+
+        # Very large payloads bypass the SQL parser entirely
+        if len(data) >= LOAD_DATA_MIN_ROWS:
+            return self._insert_via_load_data(table_name, columns, data)
+
         try:
             with self.get_cursor() as cursor:
-                # Get column names from the first record
-                columns = list(data[0].keys())
-                placeholders = ', '.join(['%s'] * len(columns))
-                columns_str = ', '.join(f"`{col}`" for col in columns)
+                columns_key = tuple(columns)
+
+                # Explicit multi-VALUES statements collapse N rows into
+                # N/INSERT_BATCH_SIZE round-trips regardless of whether the
+                # driver rewrites executemany
+                # itemgetter assembles the value tuples in C; fall back to
+                # dict.get only if some record is missing a column
+                getter = operator.itemgetter(*columns)
+
+                inserted_count = 0
+                for start in range(0, len(data), INSERT_BATCH_SIZE):
+                    batch = data[start:start + INSERT_BATCH_SIZE]
+                    stmt_key = (table_name, columns_key, len(batch))
+                    insert_query = self._insert_stmt_cache.get(stmt_key)
+                    if insert_query is None:
+                        placeholders = f"({', '.join(['%s'] * len(columns))})"
+                        columns_str = ', '.join(f"`{col}`" for col in columns)
+                        insert_query = (
+                            f"INSERT INTO `{table_name}` ({columns_str}) VALUES "
+                            + ", ".join([placeholders] * len(batch))
+                        )
+                        self._insert_stmt_cache[stmt_key] = insert_query
+                    try:
+                        if len(columns) > 1:
+                            flat_values = [v for record in batch for v in getter(record)]
+                        else:
+                            flat_values = [getter(record) for record in batch]
+                    except KeyError:
+                        flat_values = [record.get(col) for record in batch for col in columns]
+                    cursor.execute(insert_query, flat_values)
+                    inserted_count += cursor.rowcount
+
+                self.logger.info(f"✅ Inserted {inserted_count} records into {table_name}")
+                return inserted_count
 
-                insert_query = f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})"
+        except Exception as e:
+            self.logger.error(f"❌ Failed to insert data into {table_name}: {e}")
+            raise
+
+    def _insert_via_load_data(self, table_name: str, columns: List[str],
+                              data: List[Dict[str, Any]]) -> int:
+        """Bulk-load rows with LOAD DATA LOCAL INFILE
 
-                # Prepare data for insertion
-                values_list = []
+        Streams a temporary TSV file into the storage engine, skipping
+        per-row SQL parsing; requires local_infile enabled on both ends.
+        """
+        import os
+        import tempfile
+
+        tmp = tempfile.NamedTemporaryFile(
+            "w", suffix=".tsv", delete=False, encoding="utf-8"
+        )
+        try:
+            with tmp:
                 for record in data:
-                    values = [record.get(col) for col in columns]
-                    values_list.append(values)
+                    tmp.write("\t".join(_infile_value(record.get(col)) for col in columns))
+                    tmp.write("\n")
+
+            columns_str = ', '.join(f"`{col}`" for col in columns)
+            load_query = (
+                f"LOAD DATA LOCAL INFILE '{tmp.name}' INTO TABLE `{table_name}` "
+                f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({columns_str})"
+            )
 
-                # Execute batch insert
-                cursor.executemany(insert_query, values_list)
+            with self.get_cursor() as cursor:
+                cursor.execute(load_query)
                 inserted_count = cursor.rowcount
 
-                self.logger.info(f"✅ Inserted {inserted_count} records into {table_name}")
-                return inserted_count
+            self.logger.info(f"✅ Bulk-loaded {inserted_count} records into {table_name}")
+            return inserted_count
 
         except Exception as e:
-            self.logger.error(f"❌ Failed to insert data into {table_name}: {e}")
+            self.logger.error(f"❌ Failed to bulk-load data into {table_name}: {e}")
             raise
+        finally:
+            os.unlink(tmp.name)
 
     def update_data(self, table_name: str, data: Dict[str, Any], where_clause: str) -> int:
         """Update data in a table"""
         try:
             with self.get_cursor() as cursor:
-                # Build SET clause
-                set_clauses = []
-                values = []
-                for key, value in data.items():
-                    set_clauses.append(f"`{key}` = %s")
-                    values.append(value)
-
-                set_clause = ', '.join(set_clauses)
-                update_query = f"UPDATE `{table_name}` SET {set_clause} WHERE {where_clause}"
-
+                # The statement shape is determined by (table, columns,
+                # where clause); reuse the built SQL and only rebind values
+                columns = tuple(data.keys())
+                stmt_key = ("update", table_name, columns, where_clause)
+                update_query = self._stmt_cache.get(stmt_key)
+                if update_query is None:
+                    set_clause = ', '.join(f"`{key}` = %s" for key in columns)
+                    update_query = f"UPDATE `{table_name}` SET {set_clause} WHERE {where_clause}"
+                    self._stmt_cache[stmt_key] = update_query
+
+                values = [data[key] for key in columns]
                 cursor.execute(update_query, values)
                 updated_count = cursor.rowcount
 
@@ -148,7 +327,11 @@ class GeneralizedMySQLHandler(TabularDatabase):
         """Delete data from a table"""
         try:
             with self.get_cursor() as cursor:
-                delete_query = f"DELETE FROM `{table_name}` WHERE {where_clause}"
+                stmt_key = ("delete", table_name, where_clause)
+                delete_query = self._stmt_cache.get(stmt_key)
+                if delete_query is None:
+                    delete_query = f"DELETE FROM `{table_name}` WHERE {where_clause}"
+                    self._stmt_cache[stmt_key] = delete_query
                 cursor.execute(delete_query)
                 deleted_count = cursor.rowcount
 
@@ -161,6 +344,11 @@ class GeneralizedMySQLHandler(TabularDatabase):
 
     def get_table_schema(self, table_name: str) -> Dict[str, Any]:
         """Get table schema information"""
+        cache_key = ("schema", table_name)
+        cached = self._metadata_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             with self.get_cursor() as cursor:
                 # Get column information
@@ -177,6 +365,7 @@ class GeneralizedMySQLHandler(TabularDatabase):
                     "row_count": stats["row_count"] if stats else 0
                 }
 
+                self._metadata_cache[cache_key] = schema_info
                 self.logger.info(f"📋 Retrieved schema for table {table_name}")
                 return schema_info
 
@@ -186,12 +375,17 @@ class GeneralizedMySQLHandler(TabularDatabase):
 
     def list_tables(self) -> List[str]:
         """List all tables in the database"""
+        cached = self._metadata_cache.get("tables")
+        if cached is not None:
+            return cached
+
         try:
             with self.get_cursor() as cursor:
                 cursor.execute("SHOW TABLES")
                 tables = cursor.fetchall()
                 table_names = [list(table.values())[0] for table in tables]
 
+                self._metadata_cache["tables"] = table_names
                 self.logger.info(f"📋 Found {len(table_names)} tables in database")
                 return table_names
 
@@ -212,6 +406,8 @@ class GeneralizedMySQLHandler(TabularDatabase):
                 create_query = f"CREATE TABLE `{table_name}` ({columns_str})"
 
                 cursor.execute(create_query)
+                # New table invalidates the cached metadata
+                self._metadata_cache.clear()
                 self.logger.info(f"✅ Created table {table_name}")
 
         except Exception as e:
@@ -221,8 +417,13 @@ class GeneralizedMySQLHandler(TabularDatabase):
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists"""
         try:
-            tables = self.list_tables()
-            return table_name in tables
+            with self.get_cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM information_schema.tables "
+                    "WHERE table_schema = %s AND table_name = %s LIMIT 1",
+                    [self.database, table_name]
+                )
+                return cursor.fetchone() is not None
         except Exception as e:
             self.logger.error(f"❌ Failed to check if table {table_name} exists: {e}")
             return False
@@ -231,21 +432,22 @@ class GeneralizedMySQLHandler(TabularDatabase):
         """Get database statistics"""
         try:
             with self.get_cursor() as cursor:
-                # Get database size
+                # One scan yields both the table list and the sizes
                 cursor.execute("""
                     SELECT
-                        ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) AS size_mb
+                        table_name AS table_name,
+                        ROUND((data_length + index_length) / 1024 / 1024, 2) AS size_mb
                     FROM information_schema.tables
                     WHERE table_schema = %s
                 """, [self.database])
 
-                size_info = cursor.fetchone()
-                tables = self.list_tables()
+                rows = cursor.fetchall()
+                tables = [row["table_name"] for row in rows]
 
                 stats = {
                     "database_name": self.database,
                     "table_count": len(tables),
-                    "size_mb": size_info["size_mb"] if size_info else 0,
+                    "size_mb": round(sum(row["size_mb"] or 0 for row in rows), 2),
                     "tables": tables
                 }
 
@@ -257,11 +459,11 @@ class GeneralizedMySQLHandler(TabularDatabase):
             raise
 
     def close(self) -> None:
-        """Close database connection"""
+        """Return the connection to the pool"""
         if self.connection:
             self.connection.close()
             self.connection = None
-            self.logger.info("🔒 MySQL connection closed")
+            self.logger.info("🔒 MySQL connection returned to pool")
 
     def __enter__(self):
         """Context manager entry"""
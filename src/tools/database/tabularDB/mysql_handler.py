@@ -5,12 +5,21 @@ from src.config import (
     MYSQL_DATABASE,
     MYSQL_PORT,
 )
+import asyncio
 import pymysql
 import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
+# connectorx reads the MySQL binary protocol in Rust and writes straight
+# into columnar buffers - much faster than the SQLAlchemy row path for
+# wide/long results. Optional: fall back to pandas.read_sql without it.
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
 class MySQLHandler:
 
     def __init__(self, user, password, host, database, port=3306, echo=False):
@@ -21,14 +30,28 @@ class MySQLHandler:
         self.engine = create_engine(url, echo=echo, pool_pre_ping=True)
         self.Session = sessionmaker(bind=self.engine)
         self.session = None
+        self._cx_url = f"mysql://{user}:{password}@{host}:{port}/{database}"
 
     def fetch_df(self, query, params=None):
         """
         Fetch query results directly into a Pandas DataFrame.
         """
         try:
+            # connectorx only handles SELECT-shaped statements (it wraps the
+            # query as a derived table); SHOW/DESCRIBE etc. must take the
+            # pandas path
+            is_select = query.lstrip().lower().startswith(("select", "with"))
+            if cx is not None and params is None and is_select:
+                return cx.read_sql(self._cx_url, query, return_type="pandas")
             df = pd.read_sql(text(query), self.engine, params=params)
             return df
         except Exception as e:
             print(f"❌ Error fetching DataFrame: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def a_fetch_df(self, query, params=None):
+        """
+        Async wrapper for fetch_df; runs the blocking read in a worker
+        thread so callers can gather it with other I/O.
+        """
+        return await asyncio.to_thread(self.fetch_df, query, params)
\ No newline at end of file
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+MySQL Connection Pool
+
+Shares pooled DB-API connections across tool calls so each MCP request
+reuses an already-open connection instead of paying the TCP + auth handshake.
+Pooling is backed by SQLAlchemy engines (QueuePool) with pre-ping and
+recycling, so dead connections are replaced transparently.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+
+from . import _driver
+from src.config import MYSQL_CONFIG
+
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+MYSQL_POOL_MAX_OVERFLOW = int(os.getenv("MYSQL_POOL_MAX_OVERFLOW", "20"))
+
+# Engines keyed by connection parameters, created on first use
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(host: str,
+               user: str,
+               password: str,
+               database: str,
+               port: int = 3306,
+               charset: str = 'utf8mb4'):
+    """Get (or lazily create) the pooled engine for the given parameters"""
+    key = (host, user, database, port)
+
+    with _engines_lock:
+        if key not in _engines:
+            url = URL.create(
+                "mysql+mysqldb" if _driver.DRIVER_NAME == "mysqlclient" else "mysql+pymysql",
+                username=user,
+                password=password,
+                host=host,
+                port=port,
+                database=database,
+                query={"charset": charset}
+            )
+
+            _engines[key] = create_engine(
+                url,
+                pool_size=MYSQL_POOL_SIZE,
+                max_overflow=MYSQL_POOL_MAX_OVERFLOW,
+                pool_pre_ping=True,
+                pool_recycle=1800,
+                # Default rollback-on-return stays enabled: readers that bail
+                # out of a streaming cursor early (e.g. a hit row limit) would
+                # otherwise park an open REPEATABLE READ snapshot in the pool
+                # and serve stale data on the next checkout
+                connect_args={"cursorclass": _driver.DictCursor, "local_infile": True}
+            )
+
+        return _engines[key]
+
+@contextmanager
+def acquire(use_pool: bool = True):
+    """Context manager yielding a handler for the configured database
+
+    Args:
+        use_pool: Pass False for rarely-called admin paths so they neither
+            warm nor hold a slot in the shared pool
+    """
+    from src.tools.database.base_database import DatabaseFactory
+
+    tabular_db = DatabaseFactory.create_tabular_db(
+        "mysql",
+        host=MYSQL_CONFIG.host,
+        user=MYSQL_CONFIG.user,
+        password=MYSQL_CONFIG.password,
+        database=MYSQL_CONFIG.database,
+        port=MYSQL_CONFIG.port,
+        use_pool=use_pool
+    )
+
+    try:
+        yield tabular_db
+    finally:
+        tabular_db.close()
@@ -5,9 +5,13 @@ Generalized Milvus Database Client
 Handles storage and retrieval of document chunks with configurable schemas and embeddings.
 """
 
-import json
+import asyncio
+import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType, utility
+from cachetools import TTLCache
 import logging
 from datetime import datetime
 from pymilvus import MilvusClient, DataType, Function, FunctionType
@@ -17,6 +21,12 @@ from pymilvus import RRFRanker
 from .schema_config import CollectionConfig, SchemaFactory
 from ..base_database import VectorDatabase
 
+logger = logging.getLogger(__name__)
+
+# Rows per insert RPC; single monolithic inserts stall the proxy while
+# tiny ones under-utilize gRPC
+STORE_CHUNK_SIZE = 1000
+
 class GeneralizedMilvusHandler(VectorDatabase):
     """Generalized Milvus vector database client for various document types"""
 
@@ -49,12 +59,33 @@ class GeneralizedMilvusHandler(VectorDatabase):
         self.schema_type = schema_type
         self.collection = None
         self.schema_config = None
+        self._initialized = False
+
+        # Prepared once; per-call search requests only rebind data/filters
+        self._ranker = RRFRanker(100)
+        self._dense_search_params = {"nprobe": 10}
+        self._sparse_search_params = {"drop_ratio_search": 0.2}
+
+        # Collection descriptions are static within a session; cache them so
+        # search paths skip the metadata round-trip
+        self._describe_cache = TTLCache(maxsize=16, ttl=300)
+        self._output_fields = None
+        self._embedding_field_names = frozenset()
+
+        # Compiled filter strings keyed by filter shape; chat/RAG callers
+        # re-issue the same few shapes thousands of times
+        self._filter_cache: Dict[tuple, Optional[str]] = {}
+
+        # Exact-match result cache; chatbot traffic repeats queries verbatim
+        # (retries, re-ranks), and fp16 rounding of the embedding makes the
+        # key robust to float noise
+        self._search_cache = TTLCache(maxsize=1024, ttl=300)
 
         self.client = MilvusClient(uri=self.host, token=f"root:{self.password}", db_name=self.db_name)
 
-        # Configure logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        # Logging configuration belongs to the application entrypoint;
+        # instances just share the module logger
+        self.logger = logger
 
         # Initialize schema configuration
         self._setup_schema()
@@ -72,19 +103,44 @@ class GeneralizedMilvusHandler(VectorDatabase):
         else:
             raise ValueError(f"Unsupported schema type: {self.schema_type}")
 
+        # Field names depend only on the schema type; bind them once here
+        # instead of on every search
+        self._dense_field = "embedding"
+        self._sparse_field = "sparse_embedding"
+        self._content_field = "content" if self.schema_type == "document" else "chunk_text"
+
     def set_custom_schema(self, schema_config: CollectionConfig):
         """Set a custom schema configuration"""
         self.schema_config = schema_config
         self.collection_name = schema_config.name
+        self._initialized = False
+        self._output_fields = None
+        self._embedding_field_names = frozenset()
+        # Cached filters and results belong to the previous collection
+        self._filter_cache.clear()
+        self._search_cache.clear()
 
     def initialize_collection(self):
-        """Initialize or create the collection based on the schema configuration"""
+        """Initialize or create the collection based on the schema configuration
+
+        Idempotent: after the first successful call the existence check and
+        metadata RPCs are skipped entirely.
+        """
+        if self._initialized:
+            return
+
         try:
             if self.client.has_collection(self.collection_name):
                 self.logger.info(f"📚 Using existing collection: {self.collection_name}")
             else:
                 self._create_collection()
 
+            # Output fields depend only on the schema; compute them once here
+            # so the search hot path never touches collection metadata
+            self._output_fields = None
+            self._get_output_fields()
+
+            self._initialized = True
             self.logger.info(f"🚀 Collection ready: {self.collection_name}")
 
         except Exception as e:
@@ -150,14 +206,58 @@ class GeneralizedMilvusHandler(VectorDatabase):
 
         self.logger.info(f"✅ Created collection: {self.collection_name}")
 
-    def store_data(self, data: List[Dict[str, Any]]) -> int:
-        """Store data in the collection"""
+    def _describe_collection_cached(self) -> Dict[str, Any]:
+        """Describe the collection, served from a short TTL cache"""
+        desc = self._describe_cache.get(self.collection_name)
+        if desc is None:
+            desc = self.client.describe_collection(self.collection_name)
+            self._describe_cache[self.collection_name] = desc
+        return desc
+
+    def _get_output_fields(self) -> tuple:
+        """Non-embedding field names, precomputed at initialization
+
+        The embedding-field set is materialized alongside so any recompute
+        is a frozenset membership test rather than per-field substring
+        scans.
+        """
+        if self._output_fields is None:
+            fields = self._describe_collection_cached()['fields']
+            self._embedding_field_names = frozenset(
+                f['name'] for f in fields if 'embedding' in f['name']
+            )
+            self._output_fields = tuple(
+                f['name'] for f in fields
+                if f['name'] not in self._embedding_field_names
+            )
+        return self._output_fields
+
+    def store_data(self, data: List[Dict[str, Any]],
+                   chunk_size: int = STORE_CHUNK_SIZE) -> int:
+        """Store data in the collection in fixed-size chunks
+
+        Multiple chunks are inserted through a small thread pool so the
+        server processes one chunk while the client marshals the next.
+        """
         if not data:
             self.logger.warning("No data to store")
             return 0
 
         try:
-            self.client.insert(collection_name=self.collection_name, data=data)
+            chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+            def _insert_chunk(chunk):
+                self.client.insert(collection_name=self.collection_name, data=chunk)
+
+            if len(chunks) > 1:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    list(executor.map(_insert_chunk, chunks))
+            else:
+                _insert_chunk(chunks[0])
+
+            # Cached results may now miss the freshly ingested rows
+            self._search_cache.clear()
+
             inserted_count = len(data)
             self.logger.info(f"✅ Inserted {inserted_count} records into {self.collection_name}")
             return inserted_count
@@ -170,25 +270,58 @@ class GeneralizedMilvusHandler(VectorDatabase):
               query_embedding: List[float] = None,
               query_text: str = None,
               top_k: int = 10,
-              filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+              filters: Dict[str, Any] = None,
+              parse_metadata: bool = True) -> List[Dict[str, Any]]:
         """
         Search for similar items (implements VectorDatabase interface)
         """
         if query_embedding is None and query_text is None:
             raise ValueError("Either query_embedding or query_text must be provided")
 
+        cache_key = (
+            query_text,
+            top_k,
+            tuple(sorted(filters.items())) if filters else None,
+            np.asarray(query_embedding, dtype=np.float16).tobytes()
+            if query_embedding is not None else None,
+            parse_metadata
+        )
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Convert filters dict to filter expressions
         filter_expr = None
         additional_filters = filters or {}
 
-        return self.hybrid_search(query_embedding, query_text, top_k, filter_expr, additional_filters)
+        results = self.hybrid_search(query_embedding, query_text, top_k, filter_expr,
+                                     additional_filters, parse_metadata=parse_metadata)
+        self._search_cache[cache_key] = results
+        return results
+
+    async def a_search(self,
+                       query_embedding: List[float] = None,
+                       query_text: str = None,
+                       top_k: int = 10,
+                       filters: Dict[str, Any] = None,
+                       parse_metadata: bool = True) -> List[Dict[str, Any]]:
+        """Async wrapper for search
+
+        The sync MilvusClient is thread-safe per collection, so the search
+        runs in a worker thread and K searches (plus MySQL lookups) can be
+        awaited concurrently with asyncio.gather.
+        """
+        return await asyncio.to_thread(
+            self.search, query_embedding, query_text, top_k, filters, parse_metadata
+        )
 
     def hybrid_search(self,
                      query_embedding: List[float],
                      query_text: str,
                      top_k: int = 10,
                      filter_expr: str = None,
-                     additional_filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+                     additional_filters: Dict[str, Any] = None,
+                     parse_metadata: bool = True) -> List[Dict[str, Any]]:
         """
         Perform hybrid search with configurable filtering
 
@@ -198,35 +331,45 @@ class GeneralizedMilvusHandler(VectorDatabase):
             top_k: Number of results to return
             filter_expr: Raw filter expression
             additional_filters: Key-value pairs for additional filtering
+            parse_metadata: Decode metadata JSON blobs; pass False for raw
+                pass-through callers to skip the per-hit parse
         """
-        ranker = RRFRanker(100)
-
         try:
-            # Build filter expression
-            filter_conditions = []
-
-            if filter_expr:
-                filter_conditions.append(filter_expr)
-
-            if additional_filters:
-                for key, value in additional_filters.items():
-                    if isinstance(value, str):
-                        filter_conditions.append(f'{key} == "{value}"')
-                    else:
-                        filter_conditions.append(f'{key} == {value}')
+            # Build (or reuse) the compiled filter expression
+            cache_key = (
+                filter_expr,
+                tuple(sorted((k, type(v).__name__, v)
+                             for k, v in (additional_filters or {}).items()))
+            )
+            if cache_key in self._filter_cache:
+                final_filter = self._filter_cache[cache_key]
+            else:
+                filter_conditions = []
+
+                if filter_expr:
+                    filter_conditions.append(filter_expr)
+
+                if additional_filters:
+                    for key, value in additional_filters.items():
+                        if isinstance(value, str):
+                            # Escape backslashes and quotes so user-supplied
+                            # values can't break out of the expression
+                            escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+                            filter_conditions.append(f'{key} == "{escaped}"')
+                        else:
+                            filter_conditions.append(f'{key} == {value}')
 
-            final_filter = " and ".join(filter_conditions) if filter_conditions else None
+                final_filter = " and ".join(filter_conditions) if filter_conditions else None
 
-            # Determine field names for dense and sparse embeddings
-            dense_field = "embedding"
-            sparse_field = "sparse_embedding"
-            content_field = "content" if self.schema_type == "document" else "chunk_text"
+                if len(self._filter_cache) >= 1024:
+                    self._filter_cache.clear()
+                self._filter_cache[cache_key] = final_filter
 
             # Configure search parameters
             search_param_1 = {
                 "data": [query_embedding],
-                "anns_field": dense_field,
-                "param": {"nprobe": 10},
+                "anns_field": self._dense_field,
+                "param": self._dense_search_params,
                 "limit": top_k,
                 "expr": final_filter,
             }
@@ -234,8 +377,8 @@ class GeneralizedMilvusHandler(VectorDatabase):
 
             search_param_2 = {
                 "data": [query_text],
-                "anns_field": sparse_field,
-                "param": {"drop_ratio_search": 0.2},
+                "anns_field": self._sparse_field,
+                "param": self._sparse_search_params,
                 "limit": top_k,
                 "expr": final_filter,
             }
@@ -243,14 +386,13 @@ class GeneralizedMilvusHandler(VectorDatabase):
 
             reqs = [request_1, request_2]
 
-            # Get field names for output (excluding embedding fields)
-            desc = self.client.describe_collection(self.collection_name)['fields']
-            fields = [i['name'] for i in desc if 'embedding' not in i['name']]
+            # Field names for output (excluding embedding fields)
+            fields = self._get_output_fields()
 
             results = self.client.hybrid_search(
                 collection_name=self.collection_name,
                 reqs=reqs,
-                ranker=ranker,
+                ranker=self._ranker,
                 limit=top_k,
                 output_fields=fields
             )
@@ -267,10 +409,10 @@ class GeneralizedMilvusHandler(VectorDatabase):
                     # Add all entity fields
                     for field_name in fields:
                         value = hit.entity.get(field_name)
-                        if field_name == "metadata" and isinstance(value, str):
+                        if parse_metadata and field_name == "metadata" and isinstance(value, str):
                             try:
-                                result[field_name] = json.loads(value)
-                            except:
+                                result[field_name] = orjson.loads(value)
+                            except orjson.JSONDecodeError:
                                 result[field_name] = value
                         else:
                             result[field_name] = value
@@ -294,9 +436,8 @@ class GeneralizedMilvusHandler(VectorDatabase):
         """Query data from the collection without vector search"""
         try:
             if output_fields is None:
-                # Get all non-embedding fields
-                desc = self.client.describe_collection(self.collection_name)['fields']
-                output_fields = [i['name'] for i in desc if 'embedding' not in i['name']]
+                # All non-embedding fields
+                output_fields = list(self._get_output_fields())
 
             results = self.client.query(
                 collection_name=self.collection_name,
@@ -312,17 +453,47 @@ class GeneralizedMilvusHandler(VectorDatabase):
             self.logger.error(f"❌ Query failed: {e}")
             raise
 
-    def get_unique_values(self, field_name: str) -> List[str]:
-        """Get unique values for a specific field"""
-        try:
-            results = self.client.query(
-                collection_name=self.collection_name,
-                filter=f"{field_name} != ''",
-                output_fields=[field_name],
-                limit=10000
-            )
+    def get_unique_values(self, field_name: str, page_size: int = 1000) -> List[str]:
+        """Get unique values for a specific field
 
-            unique_values = list(set(row[field_name] for row in results if row[field_name]))
+        Pages through the collection (query iterator when available,
+        offset/limit otherwise) and folds each page into a set, so large
+        collections are fully covered without a truncating single query or
+        all rows resident at once.
+        """
+        filter_expr = f"{field_name} != ''"
+        seen = set()
+
+        try:
+            if hasattr(self.client, "query_iterator"):
+                iterator = self.client.query_iterator(
+                    collection_name=self.collection_name,
+                    filter=filter_expr,
+                    output_fields=[field_name],
+                    batch_size=page_size
+                )
+                while True:
+                    page = iterator.next()
+                    if not page:
+                        iterator.close()
+                        break
+                    seen.update(row[field_name] for row in page if row[field_name])
+            else:
+                offset = 0
+                while True:
+                    page = self.client.query(
+                        collection_name=self.collection_name,
+                        filter=filter_expr,
+                        output_fields=[field_name],
+                        offset=offset,
+                        limit=page_size
+                    )
+                    seen.update(row[field_name] for row in page if row[field_name])
+                    if len(page) < page_size:
+                        break
+                    offset += page_size
+
+            unique_values = list(seen)
             self.logger.info(f"📋 Found {len(unique_values)} unique values for {field_name}")
             return unique_values
 
@@ -338,6 +509,14 @@ class GeneralizedMilvusHandler(VectorDatabase):
                 self.logger.info(f"🗑️ Deleted collection: {self.collection_name}")
             else:
                 self.logger.info(f"Collection {self.collection_name} does not exist")
+
+            # Drop every cache derived from the (now gone) collection so a
+            # recreate starts from a clean slate
+            self._initialized = False
+            self._output_fields = None
+            self._embedding_field_names = frozenset()
+            self._describe_cache.clear()
+            self._search_cache.clear()
         except Exception as e:
             self.logger.error(f"❌ Failed to delete collection: {e}")
             raise
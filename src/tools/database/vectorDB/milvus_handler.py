@@ -5,7 +5,10 @@ Milvus Database Client
 Handles storage and retrieval of document chunks with embeddings.
 """
 
-import json
+import asyncio
+import math
+import operator
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType, utility
 import logging
@@ -14,10 +17,50 @@ from pymilvus import MilvusClient, DataType, Function, FunctionType
 from pymilvus import AnnSearchRequest
 from pymilvus import RRFRanker
 
+logger = logging.getLogger(__name__)
+
+# Rows per insert RPC; amortizes per-insert WAL/lock overhead without
+# exceeding the proxy's per-RPC budget
+STORE_BATCH_SIZE = 1000
+
+def _to_columns(chunks: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Transpose row dicts (AoS) into columns (SoA)
+
+    itemgetter runs the per-row lookup in C, avoiding F dict hashes per row
+    in interpreter code.
+    """
+    fields = list(chunks[0].keys())
+    getters = {k: operator.itemgetter(k) for k in fields}
+    return {k: list(map(g, chunks)) for k, g in getters.items()}
+
+def _pack_embeddings(chunks: List[Dict[str, Any]], dtype=np.float32) -> None:
+    """Repack per-row embedding lists into views of one contiguous matrix
+
+    Collapses N lists of Python floats (~24 bytes each) into a single
+    buffer of the collection's vector dtype; pymilvus accepts ndarray
+    vectors directly.
+    """
+    if not chunks or "embedding" not in chunks[0]:
+        return
+    embeddings = list(map(operator.itemgetter("embedding"), chunks))
+    matrix = np.asarray(embeddings, dtype=dtype)
+    for row, vector in zip(chunks, matrix):
+        row["embedding"] = vector
+
+def embedding_memmap(path: str, n_rows: int, dim: int = 4096) -> np.memmap:
+    """Preallocate a disk-backed float32 (n_rows, dim) embedding matrix
+
+    Workers fill rows in place (arr[i] = vector) without allocating Python
+    floats; pass the array as the "embedding" column to
+    MilvusHandler.store_columns for zero-copy bulk ingest.
+    """
+    return np.memmap(path, dtype=np.float32, mode="w+", shape=(n_rows, dim))
+
 class MilvusHandler:
     """Milvus vector database client for annual report content"""
 
-    def __init__(self, host: str, port: str = "19530", db_name: str = "default", password: str = None):
+    def __init__(self, host: str, port: str = "19530", db_name: str = "default",
+                 password: Optional[str] = None) -> None:
         self.host = host
         self.port = port
         self.db_name = db_name
@@ -26,11 +69,16 @@ class MilvusHandler:
         self.collection = None
 
         self.client = MilvusClient(uri=self.host, token=f"root:{self.password}", db_name=self.db_name)
-        # Configure logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
+
+        # Allocated once; per-call search params only rebind data/expr/limit
+        self._ranker = RRFRanker(100)
+        self._dense_param_tmpl = {"anns_field": "embedding"}
+        self._sparse_param_tmpl = {"anns_field": "sparse_embedding", "param": {"drop_ratio_search": 0.2}}
+        self._dense_index = None
+        self._emb_dtype = None
 
-    def _initialize_collection(self):
+    def _initialize_collection(self) -> None:
         """Initialize or create the annual report collection"""
         try:
             # Check if collection exists
@@ -49,8 +97,33 @@ class MilvusHandler:
             self.logger.error(f"❌ Failed to initialize collection: {e}")
             raise
 
-    def _create_collection(self):
-        """Create the annual report collection"""
+    def _create_collection(self, index_type: str = "HNSW", server_side_bm25: bool = True,
+                           vector_datatype: DataType = DataType.FLOAT16_VECTOR,
+                           use_quantization: Optional[bool] = None,
+                           sparse_algo: str = "DAAT_MAXSCORE") -> None:
+        """Create the annual report collection
+
+        Args:
+            index_type: Dense index type; HNSW (default) for low-latency
+                in-memory search, DiskANN for SSD-backed large corpora, or
+                IVF_FLAT for the previous scan-based behavior
+            vector_datatype: Storage dtype of the dense embeddings; FP16
+                (default) halves the footprint, FLOAT_VECTOR restores the
+                original full-precision behavior
+            use_quantization: Quantize the dense index (HNSW_SQ with SQ8,
+                or IVF_PQ for IVF) to cut index memory several-fold at
+                <=2% recall loss; defaults to on for high-dim vectors
+            sparse_algo: Inverted-index algorithm for the sparse field;
+                DAAT_MAXSCORE suits BM25 weights, DAAT_WAND can win on
+                learned-sparse (e.g. SPLADE) vector distributions
+            server_side_bm25: Attach the BM25 function so the Milvus proxy
+                tokenizes and scores chunk_text on every insert/query. Pass
+                False to keep sparse_embedding a plain field and insert
+                sparse vectors precomputed client-side (e.g. with BM25S,
+                which sidesteps the proxy-side tokenizer entirely)
+        """
+        dim = 4096
+
         schema = self.client.create_schema()
 
         schema.add_field(field_name="chunk_id", datatype=DataType.INT64, is_primary=True, auto_id=True)
@@ -59,38 +132,60 @@ class MilvusHandler:
         schema.add_field(field_name="year", datatype=DataType.VARCHAR, max_length=10)
         # schema.add_field(field_name="item_type", datatype=DataType.VARCHAR, max_length=50)
         # schema.add_field(field_name="item_title", datatype=DataType.VARCHAR, max_length=200)
-        schema.add_field(field_name="chunk_text", datatype=DataType.VARCHAR, max_length=10000, enable_analyzer=True) ## Chinese character required more bytes to store
+        # mmap keeps the bulky raw text out of RAM (a page fault on hit
+        # fetch) while the vector index stays memory-resident
+        schema.add_field(field_name="chunk_text", datatype=DataType.VARCHAR, max_length=10000, enable_analyzer=True, mmap_enabled=True) ## Chinese character required more bytes to store
         schema.add_field(field_name="chunk_index", datatype=DataType.INT64)
         schema.add_field(field_name="chunk_length", datatype=DataType.INT64)
-        schema.add_field(field_name="embedding", datatype=DataType.FLOAT_VECTOR, dim=4096)  # Updated to 4096
+        # fp16 halves vector memory and scan bandwidth; cosine recall loss
+        # is negligible at this precision
+        schema.add_field(field_name="embedding", datatype=vector_datatype, dim=dim)  # Updated to 4096
         # schema.add_field(field_name="metadata", datatype=DataType.VARCHAR, max_length=1000)
         schema.add_field(field_name="created_at", datatype=DataType.VARCHAR, max_length=50)
         schema.add_field(field_name="sparse_embedding", datatype=DataType.SPARSE_FLOAT_VECTOR)
 
-        bm25_function = Function(
-            name="text_bm25_emb",  # Function name
-            input_field_names=["chunk_text"],  # Name of the VARCHAR field containing raw text data
-            output_field_names=["sparse_embedding"],
-            # Name of the SPARSE_FLOAT_VECTOR field reserved to store generated embeddings
-            function_type=FunctionType.BM25,  # Set to `BM25`
-        )
-        schema.add_function(bm25_function)
+        if server_side_bm25:
+            bm25_function = Function(
+                name="text_bm25_emb",  # Function name
+                input_field_names=["chunk_text"],  # Name of the VARCHAR field containing raw text data
+                output_field_names=["sparse_embedding"],
+                # Name of the SPARSE_FLOAT_VECTOR field reserved to store generated embeddings
+                function_type=FunctionType.BM25,  # Set to `BM25`
+            )
+            schema.add_function(bm25_function)
 
         index_params = self.client.prepare_index_params()
 
-        index_params.add_index(
-            field_name="embedding",
-            index_name="text_dense_index",
-            index_type="IVF_FLAT",
-            metric_type="COSINE"
-        )
+        # A 4096-dim corpus is memory-bound at load and query time, so
+        # quantize by default for high-dim vectors
+        if use_quantization is None:
+            use_quantization = dim >= 1024
+
+        dense_index = {
+            "field_name": "embedding",
+            "index_name": "text_dense_index",
+            "index_type": index_type,
+            "metric_type": "COSINE"
+        }
+        if index_type == "HNSW":
+            if use_quantization:
+                dense_index["index_type"] = "HNSW_SQ"
+                dense_index["params"] = {"M": 16, "efConstruction": 200, "sq_type": "SQ8"}
+            else:
+                dense_index["params"] = {"M": 16, "efConstruction": 200}
+        elif index_type == "IVF_FLAT" and use_quantization:
+            # 64 subvectors of dim/64 dims each
+            dense_index["index_type"] = "IVF_PQ"
+            dense_index["params"] = {"nlist": 1024, "m": 64, "nbits": 8}
+        index_params.add_index(**dense_index)
 
         index_params.add_index(
             field_name="sparse_embedding",
             index_name="text_sparse_index",
             index_type="SPARSE_INVERTED_INDEX",
-            metric_type="BM25",
-            params={"inverted_index_algo": "DAAT_MAXSCORE"},
+            # Raw precomputed sparse vectors are scored with inner product
+            metric_type="BM25" if server_side_bm25 else "IP",
+            params={"inverted_index_algo": sparse_algo},
         )
 
         self.client.create_collection(
@@ -107,11 +202,94 @@ class MilvusHandler:
             return 0
 
         try:
+            _pack_embeddings(chunks, dtype=self._embedding_dtype())
+
+            # Insert in fixed-size mini-batches instead of one monolithic RPC
+            for i in range(0, len(chunks), STORE_BATCH_SIZE):
+                batch = chunks[i:i + STORE_BATCH_SIZE]
+                self.client.insert(collection_name=self.collection_name, data=batch)
+            inserted_count = len(chunks)
+            self.logger.info(f"✅ Inserted {inserted_count} chunks into Milvus")
+            return inserted_count
+
+        except Exception as e:
+            self.logger.error(f"❌ Failed to insert chunks: {e}")
+            raise
+
+    def store_columns(self, columns: Dict[str, Any],
+                      batch_size: int = STORE_BATCH_SIZE) -> int:
+        """Store pre-transposed (SoA) chunk data
+
+        The "embedding" column may be any (N, dim) ndarray - including an
+        np.memmap from embedding_memmap - and each inserted row holds a
+        zero-copy view into it, so bulk ingest never materializes per-row
+        Python float lists.
+        """
+        if not columns:
+            self.logger.warning("No columns to store")
+            return 0
+
+        names = list(columns.keys())
+        total = len(columns[names[0]])
+
+        try:
+            for start in range(0, total, batch_size):
+                end = min(start + batch_size, total)
+                batch = [
+                    {name: columns[name][i] for name in names}
+                    for i in range(start, end)
+                ]
+                self.client.insert(collection_name=self.collection_name, data=batch)
+
+            self.logger.info(f"✅ Inserted {total} chunks into Milvus")
+            return total
+
+        except Exception as e:
+            self.logger.error(f"❌ Failed to insert chunks: {e}")
+            raise
+
+    def _embedding_dtype(self) -> type:
+        """NumPy dtype matching the collection's embedding field"""
+        if self._emb_dtype is None:
             try:
-                self.client.insert(collection_name=self.collection_name, data=chunks)
-            except Exception as e:
-                print(chunks)
-                print(chunks)
+                fields = self.client.describe_collection(self.collection_name)['fields']
+                emb = next(f for f in fields if f['name'] == 'embedding')
+                self._emb_dtype = (np.float16
+                                   if emb.get('type') == DataType.FLOAT16_VECTOR
+                                   else np.float32)
+            except Exception:
+                self._emb_dtype = np.float32
+        return self._emb_dtype
+
+    async def a_store_chunks(self, chunks: List[Dict[str, Any]],
+                             batch_size: int = STORE_BATCH_SIZE,
+                             concurrency: int = 16) -> int:
+        """Store chunks with pipelined async inserts
+
+        Keeps up to `concurrency` insert RPCs in flight (the sync client is
+        thread-safe per collection), overlapping client-side serialization
+        with network and WAL latency on the server.
+        """
+        if not chunks:
+            self.logger.warning("No chunks to store")
+            return 0
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _insert(batch):
+            async with semaphore:
+                await asyncio.to_thread(
+                    self.client.insert,
+                    collection_name=self.collection_name,
+                    data=batch
+                )
+
+        try:
+            _pack_embeddings(chunks, dtype=self._embedding_dtype())
+
+            batches = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+            await asyncio.gather(*(_insert(batch) for batch in batches))
+
             inserted_count = len(chunks)
             self.logger.info(f"✅ Inserted {inserted_count} chunks into Milvus")
             return inserted_count
@@ -120,34 +298,85 @@ class MilvusHandler:
             self.logger.error(f"❌ Failed to insert chunks: {e}")
             raise
 
+    def _dense_index_info(self) -> Dict[str, Any]:
+        """index_type and nlist of the dense index, fetched once"""
+        if self._dense_index is None:
+            try:
+                desc = self.client.describe_index(self.collection_name, "text_dense_index")
+                self._dense_index = {
+                    "index_type": desc.get("index_type", "HNSW"),
+                    "nlist": int(desc.get("nlist", 1024)),
+                }
+            except Exception:
+                self._dense_index = {"index_type": "HNSW", "nlist": 1024}
+        return self._dense_index
+
+    def _get_nprobe(self, recall_target: str = "balanced") -> int:
+        """Derive nprobe from the dense index's nlist
+
+        Uses the √nlist heuristic: "high" probes √nlist centroids,
+        "balanced" half that, "fast" a fixed 4 for latency-critical calls.
+        """
+        root = max(1, int(math.sqrt(self._dense_index_info()["nlist"])))
+        if recall_target == "high":
+            return root
+        if recall_target == "fast":
+            return 4
+        return max(1, root // 2)
+
+    def _dense_search_param(self, top_k: int, recall_target: str = "balanced") -> Dict[str, int]:
+        """Search params matched to the actual dense index type
+
+        IVF* indexes take nprobe; HNSW* take ef (the candidate queue size),
+        scaled from top_k so deeper result lists get a wider search.
+        """
+        if self._dense_index_info()["index_type"].startswith("IVF"):
+            return {"nprobe": self._get_nprobe(recall_target)}
+        if recall_target == "high":
+            return {"ef": max(top_k * 4, 128)}
+        if recall_target == "fast":
+            return {"ef": max(top_k, 32)}
+        return {"ef": max(top_k * 2, 64)}
+
     def hybrid_search_similar_chunks(self,
                                      query_embedding: List[float],
                                      query_text: str,
                                      top_k: int = 10,
-                                     filter_expr: str = None,
-                                     company: str = None,
-                                     year: str = None,
-                                     item_types: List[str] = None) -> List[Dict[str, Any]]:
+                                     filter_expr: Optional[str] = None,
+                                     company: Optional[str] = None,
+                                     year: Optional[str] = None,
+                                     item_types: Optional[List[str]] = None,
+                                     recall_target: str = "balanced",
+                                     sparse_query_vector: Optional[Dict[int, float]] = None) -> List[Dict[str, Any]]:
+        """Hybrid dense+sparse search over the annual report collection
+
+        Collections created with server_side_bm25=False cannot score raw
+        query text; pass sparse_query_vector (same client-side encoder used
+        at ingest) and it is sent to the sparse request instead of
+        query_text.
+        """
 
-        ranker = RRFRanker(100)
         try:
-            # Build filter expression
+            # Build a templated filter: placeholders keep the expression
+            # shape stable so the proxy can cache the parsed plan, and
+            # values travel as expr_params (no quoting/injection issues)
             filter_conditions = []
-
-            self.extract_unique_company_name()
+            expr_params = {}
 
             if filter_expr:
                 filter_conditions.append(filter_expr)
 
             if company:
-                filter_conditions.append(f'company == "{company}"')
+                filter_conditions.append('company == {company}')
+                expr_params["company"] = company
 
             if year:
-                filter_conditions.append(f'year == "{year}"')
+                filter_conditions.append('year == {year}')
+                expr_params["year"] = year
 
             if item_types:
-                item_type_filter = " or ".join([f'item_type == "{item_type}"' for item_type in item_types])
-                filter_conditions.append(f"({item_type_filter})")
+                filter_conditions.append('item_type in {item_types}')
+                expr_params["item_types"] = list(item_types)
 
             # Combine filters
             final_filter = " and ".join(filter_conditions) if filter_conditions else None
@@ -160,51 +389,59 @@ class MilvusHandler:
             # }
 
             search_param_1 = {
+                **self._dense_param_tmpl,
                 "data": [query_embedding],
-                "anns_field": "embedding",
-                "param": {"nprobe": 10},
+                "param": self._dense_search_param(top_k, recall_target),
                 "limit": top_k,
                 "expr": final_filter,
+                "expr_params": expr_params,
             }
             request_1 = AnnSearchRequest(**search_param_1)
             search_param_2 = {
-                "data": [query_text],
-                "anns_field": "sparse_embedding",
-                "param": {"drop_ratio_search": 0.2},
+                **self._sparse_param_tmpl,
+                "data": [sparse_query_vector if sparse_query_vector is not None else query_text],
                 "limit": top_k,
                 "expr": final_filter,
+                "expr_params": expr_params,
             }
             request_2 = AnnSearchRequest(**search_param_2)
 
             reqs = [request_1, request_2]
-            desc = self.client.describe_collection(self.collection_name)['fields']
-            fields = [i['name'] for i in desc if 'embedding' not in i['name']]
+            # Scalar fields of the annual_report schema (see _create_collection)
+            fields = ["session_name", "company", "year", "chunk_text",
+                      "chunk_index", "chunk_length", "created_at"]
             results = self.client.hybrid_search(
                 collection_name=self.collection_name,
                 # filter=final_filter,
                 reqs=reqs,
-                ranker=ranker,
+                ranker=self._ranker,
                 limit=top_k,
                 output_fields=fields
             )
 
-            # Format results
-            formatted_results = []
+            # The fused result lists can surface the same chunk more than
+            # once; keep the best-scoring instance and format each id once
+            best_hits = {}
             for hits in results:
                 for hit in hits:
-                    result = {
-                        "chunk_id": hit.id,
-                        "item_name": hit.entity.get("item_name"),
-                        "company": hit.entity.get("company"),
-                        "year": hit.entity.get("year"),
-                        "item_type": hit.entity.get("item_type"),
-                        "item_title": hit.entity.get("item_title"),
-                        "chunk_text": hit.entity.get("chunk_text"),
-                        "chunk_index": hit.entity.get("chunk_index"),
-                        "metadata": json.loads(hit.entity.get("metadata", "{}")),
-                        "similarity_score": float(hit.score)
-                    }
-                    formatted_results.append(result)
+                    prev = best_hits.get(hit.id)
+                    if prev is None or hit.score > prev.score:
+                        best_hits[hit.id] = hit
+
+            formatted_results = []
+            for hit in best_hits.values():
+                result = {
+                    "chunk_id": hit.id,
+                    "session_name": hit.entity.get("session_name"),
+                    "company": hit.entity.get("company"),
+                    "year": hit.entity.get("year"),
+                    "chunk_text": hit.entity.get("chunk_text"),
+                    "chunk_index": hit.entity.get("chunk_index"),
+                    "chunk_length": hit.entity.get("chunk_length"),
+                    "created_at": hit.entity.get("created_at"),
+                    "similarity_score": float(hit.score)
+                }
+                formatted_results.append(result)
 
             self.logger.info(f"🔍 Found {len(formatted_results)} similar chunks")
             if final_filter:
@@ -62,8 +62,14 @@ class SchemaFactory:
         return CollectionConfig(collection_name, fields, indexes, functions)
 
     @staticmethod
-    def create_annual_report_schema(collection_name: str, embedding_dim: int = 4096) -> CollectionConfig:
-        """Create schema for annual reports (backward compatibility)"""
+    def create_annual_report_schema(collection_name: str, embedding_dim: int = 4096,
+                                    vector_datatype: DataType = DataType.FLOAT16_VECTOR) -> CollectionConfig:
+        """Create schema for annual reports (backward compatibility)
+
+        New collections store embeddings as FP16 by default, halving vector
+        memory and scan bandwidth; pass DataType.FLOAT_VECTOR for the
+        original full-precision layout.
+        """
         fields = [
             FieldConfig("chunk_id", DataType.INT64, is_primary=True, auto_id=True),
             FieldConfig("session_name", DataType.VARCHAR, max_length=100),
@@ -72,7 +78,7 @@ class SchemaFactory:
             FieldConfig("chunk_text", DataType.VARCHAR, max_length=10000, enable_analyzer=True),
             FieldConfig("chunk_index", DataType.INT64),
             FieldConfig("chunk_length", DataType.INT64),
-            FieldConfig("embedding", DataType.FLOAT_VECTOR, dim=embedding_dim),
+            FieldConfig("embedding", vector_datatype, dim=embedding_dim),
             FieldConfig("created_at", DataType.VARCHAR, max_length=50),
             FieldConfig("sparse_embedding", DataType.SPARSE_FLOAT_VECTOR)
         ]
@@ -1,18 +1,73 @@
 from typing import List, Dict, Optional
-import re
+from collections import OrderedDict
+import asyncio
+import atexit
+import logging
 import httpx
+import numpy as np
 from src.config import EMB_URL
 
-async def a_embed_query(texts: str) -> Optional[List[List[float]]]:
-    data = {'input': texts, 'type': 'query'}
-    timeout = httpx.Timeout(600, connect=10)
-    async with httpx.AsyncClient(verify=False, timeout=timeout) as client:
+logger = logging.getLogger(__name__)
+
+# LRU cache for query embeddings - agentic loops frequently re-embed the
+# same query (retries, re-ranks, follow-ups)
+_EMB_CACHE: OrderedDict = OrderedDict()
+_EMB_CACHE_MAXSIZE = 1024
+
+# Shared client so repeat embedding calls reuse TCP connections and TLS
+# sessions instead of re-handshaking per request
+_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Lazily build the shared embedding-server client"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            verify=False,
+            timeout=httpx.Timeout(600, connect=10),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    return _client
+
+def _close_client():
+    if _client is not None and not _client.is_closed:
         try:
-            print("Sending request")
-            response = await client.post(EMB_URL, json=data)
-            print("Received response")
-            return response.json()
-        except Exception as e:
-            print(str(e))
-            traceback.print_exc()
-            return None
\ No newline at end of file
+            asyncio.run(_client.aclose())
+        except RuntimeError:
+            pass
+
+atexit.register(_close_client)
+
+async def a_embed_query(texts: str) -> Optional[List[List[float]]]:
+    cache_key = " ".join(texts.lower().split())
+    cached = _EMB_CACHE.get(cache_key)
+    if cached is not None:
+        _EMB_CACHE.move_to_end(cache_key)
+        return cached
+
+    # Ask for raw little-endian float32 bytes: ~6x fewer bytes on the wire
+    # than JSON floats and decoded in one np.frombuffer call. Servers that
+    # ignore the format hint still answer with JSON.
+    data = {'input': texts, 'type': 'query', 'format': 'f32'}
+    try:
+        logger.debug("Requesting embedding")
+        response = await _get_client().post(EMB_URL, json=data)
+        response.raise_for_status()
+        if response.headers.get("content-type", "").startswith("application/octet-stream"):
+            vector = np.frombuffer(response.content, dtype=np.float32)
+            result = {'vector': vector, 'text': texts}
+        else:
+            result = response.json()
+    except Exception:
+        logger.exception("Embedding request failed")
+        return None
+
+    # Never let an error body poison the (TTL-less) cache
+    if not isinstance(result, dict) or 'vector' not in result:
+        logger.error("Embedding response missing 'vector': %r", result)
+        return None
+
+    _EMB_CACHE[cache_key] = result
+    if len(_EMB_CACHE) > _EMB_CACHE_MAXSIZE:
+        _EMB_CACHE.popitem(last=False)
+    return result
@@ -1,5 +1,5 @@
 from src.server import mcp
-import random
+import numpy as np
 
 @mcp.tool()
 def hello_world_tools(name) -> str:
@@ -11,4 +11,4 @@ def hello_world_tools(name) -> str:
 @mcp.tool()
 def roll_dice(n_dice: int) -> list[int]:
     """Roll `n_dice` 6-sided dice and return the results."""
-    return [random.randint(100, 600) for _ in range(n_dice)]
\ No newline at end of file
+    return np.random.randint(100, 601, size=n_dice).tolist()
\ No newline at end of file